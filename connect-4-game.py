@@ -1,6 +1,4 @@
 import random
-import math
-import copy
 
 # ---------------------------------------------------------
 # GAME CONFIGURATION AND CONSTANTS
@@ -17,32 +15,109 @@ WINDOW_LENGTH = 4
 # Depth determines how many moves ahead the AI calculates.
 SEARCH_DEPTH = 4
 
+# Search window bounds. Integers larger than any score (even a win) keep all
+# comparisons in the search between plain ints instead of int and float.
+INF = 10**15
+NEG_INF = -INF
+
+# Columns are searched center-first (3, 2, 4, 1, 5, 0, 6 on a 7-wide board).
+# Central moves are usually the strongest, so trying them first lets
+# Alpha-Beta prune the remaining columns sooner.
+COLUMN_ORDER = tuple(sorted(range(COLUMN_COUNT), key=lambda c: abs(c - COLUMN_COUNT // 2)))
+
+# ---------------------------------------------------------
+# BITBOARD LAYOUT
+# ---------------------------------------------------------
+# The board is stored as two integers, [mask, position]:
+#   mask     -> a bit is set for every occupied cell
+#   position -> a bit is set for every cell holding an AI piece
+# The Human's pieces are therefore (mask ^ position).
+#
+# Cells are numbered column by column, bottom to top. Every column has one
+# extra sentinel bit on top that is never set, so shifted lines can't wrap
+# from the top of one column into the bottom of the next:
+#
+#   6 13 20 27 34 41 48   <- sentinel row
+#   5 12 19 26 33 40 47
+#   4 11 18 25 32 39 46
+#   3 10 17 24 31 38 45
+#   2  9 16 23 30 37 44
+#   1  8 15 22 29 36 43
+#   0  7 14 21 28 35 42
+COLUMN_HEIGHT = ROW_COUNT + 1
+COLUMN_MASK = (1 << ROW_COUNT) - 1
+# The playable cells of each column, and of the whole board. A mask equal to
+# FULL_BOARD_MASK means every cell is filled (a draw).
+COLUMN_BITS = tuple(COLUMN_MASK << (col * COLUMN_HEIGHT) for col in range(COLUMN_COUNT))
+FULL_BOARD_MASK = sum(COLUMN_BITS)
+# The bottom cell of every column.
+BOTTOM_MASK = sum(1 << (col * COLUMN_HEIGHT) for col in range(COLUMN_COUNT))
+
+MASK = 0
+POSITION = 1
+
+# Bit shifts that move a cell to its neighbour along each line direction.
+SHIFT_VERTICAL = 1
+SHIFT_HORIZONTAL = COLUMN_HEIGHT
+SHIFT_NEG_DIAGONAL = COLUMN_HEIGHT - 1  # (\)
+SHIFT_POS_DIAGONAL = COLUMN_HEIGHT + 1  # (/)
+
 # ---------------------------------------------------------
 # BOARD MANAGEMENT FUNCTIONS
 # ---------------------------------------------------------
 
 
 def create_board():
-    """Initializes a 6x7 grid filled with zeros."""
-    board = [[EMPTY for _ in range(COLUMN_COUNT)] for _ in range(ROW_COUNT)]
+    """Initializes an empty 6x7 board (no bits set)."""
+    board = [0, 0]
     return board
 
 
+def cell_bit(row, col):
+    """Returns the bitboard bit for a (row, col) cell."""
+    return 1 << (col * COLUMN_HEIGHT + row)
+
+
 def drop_piece(board, row, col, piece):
-    """Updates the board matrix with the player's piece at the specific location."""
-    board[row][col] = piece
+    """Updates the bitboards with the player's piece at the specific location."""
+    bit = cell_bit(row, col)
+    board[MASK] |= bit
+    if piece == AI_PIECE:
+        board[POSITION] |= bit
+
+
+def get_pieces(board, piece):
+    """Returns the bitboard holding only the given player's pieces."""
+    if piece == AI_PIECE:
+        return board[POSITION]
+    return board[MASK] ^ board[POSITION]
+
+
+def get_piece(board, row, col):
+    """Returns the symbol stored in a single cell."""
+    bit = cell_bit(row, col)
+    if not board[MASK] & bit:
+        return EMPTY
+    if board[POSITION] & bit:
+        return AI_PIECE
+    return PLAYER_PIECE
 
 
 def is_valid_location(board, col):
     """Checks if the selected column has space available (top row is empty)."""
-    return board[ROW_COUNT - 1][col] == EMPTY
+    return not board[MASK] & cell_bit(ROW_COUNT - 1, col)
 
 
 def get_next_open_row(board, col):
     """Finds the lowest empty row in a column (simulates gravity)."""
-    for r in range(ROW_COUNT):
-        if board[r][col] == EMPTY:
-            return r
+    # Columns fill from the bottom, so the occupied bits are contiguous and
+    # their count is the index of the next open row.
+    return ((board[MASK] >> (col * COLUMN_HEIGHT)) & COLUMN_MASK).bit_length()
+
+
+def board_to_grid(board):
+    """Expands the bitboards into a ROW_COUNT x COLUMN_COUNT grid of symbols."""
+    return [[get_piece(board, r, c) for c in range(COLUMN_COUNT)] for r in range(ROW_COUNT)]
 
 
 def print_board(board):
@@ -52,201 +127,289 @@ def print_board(board):
     """
     print("\n  0 1 2 3 4 5 6")
     print("----------------")
-    for row in reversed(board):
+    for row in reversed(board_to_grid(board)):
         print("| " + " ".join(str(x) for x in row) + " |")
     print("----------------")
 
 
-def get_valid_locations(board):
-    """Returns a list of all column indices that are valid to play in."""
-    valid_locations = []
-    for col in range(COLUMN_COUNT):
-        if is_valid_location(board, col):
-            valid_locations.append(col)
-    return valid_locations
-
-
 def winning_move(board, piece):
     """
-    Scans the entire board to check if the given piece has won.
+    Checks if the given piece has won.
     Returns True if there are 4 connected pieces.
     """
-    # 1. Check Horizontal locations
-    for c in range(COLUMN_COUNT - 3):
-        for r in range(ROW_COUNT):
-            if board[r][c] == piece and board[r][c+1] == piece and board[r][c+2] == piece and board[r][c+3] == piece:
-                return True
+    pieces = board[POSITION] if piece == AI_PIECE else board[MASK] ^ board[POSITION]
+
+    # Each bit of a pairs value marks a cell whose neighbour along that
+    # direction is also owned; two overlapping pairs make a line of 4.
+    # The four directions are independent, so the check is straight-line code.
+    vertical = pieces & (pieces >> SHIFT_VERTICAL)
+    horizontal = pieces & (pieces >> SHIFT_HORIZONTAL)
+    neg_diagonal = pieces & (pieces >> SHIFT_NEG_DIAGONAL)
+    pos_diagonal = pieces & (pieces >> SHIFT_POS_DIAGONAL)
+
+    return bool(
+        vertical & (vertical >> (2 * SHIFT_VERTICAL))
+        or horizontal & (horizontal >> (2 * SHIFT_HORIZONTAL))
+        or neg_diagonal & (neg_diagonal >> (2 * SHIFT_NEG_DIAGONAL))
+        or pos_diagonal & (pos_diagonal >> (2 * SHIFT_POS_DIAGONAL))
+    )
 
-    # 2. Check Vertical locations
-    for c in range(COLUMN_COUNT):
-        for r in range(ROW_COUNT - 3):
-            if board[r][c] == piece and board[r+1][c] == piece and board[r+2][c] == piece and board[r+3][c] == piece:
-                return True
-
-    # 3. Check Positively Sloped Diagonals (/)
-    for c in range(COLUMN_COUNT - 3):
-        for r in range(ROW_COUNT - 3):
-            if board[r][c] == piece and board[r+1][c+1] == piece and board[r+2][c+2] == piece and board[r+3][c+3] == piece:
-                return True
+# ---------------------------------------------------------
+# SCORING ALGORITHMS (HEURISTICS)
+# ---------------------------------------------------------
 
-    # 4. Check Negatively Sloped Diagonals (\)
-    for c in range(COLUMN_COUNT - 3):
-        for r in range(3, ROW_COUNT):
-            if board[r][c] == piece and board[r-1][c+1] == piece and board[r-2][c+2] == piece and board[r-3][c+3] == piece:
-                return True
 
-    return False
+def window_mask(row, col, d_row, d_col):
+    """Returns the bitboard mask of the 4 cells starting at (row, col) and stepping by (d_row, d_col)."""
+    mask = 0
+    for i in range(WINDOW_LENGTH):
+        mask |= cell_bit(row + i * d_row, col + i * d_col)
+    return mask
 
 
-def is_terminal_node(board):
-    """Checks if the game has ended (Win for Player, Win for AI, or Draw)."""
-    return winning_move(board, PLAYER_PIECE) or winning_move(board, AI_PIECE) or len(get_valid_locations(board)) == 0
+# Every window of 4 cells on the board, precomputed once as a bitboard mask:
+# horizontal, vertical, positive diagonal (/) and negative diagonal (\).
+# Like the other lookup tables it is a tuple, since it never changes and
+# tuples are slightly faster to iterate and index than lists.
+WINDOWS = tuple(
+    [window_mask(r, c, 0, 1) for r in range(ROW_COUNT) for c in range(COLUMN_COUNT - 3)]
+    + [window_mask(r, c, 1, 0) for c in range(COLUMN_COUNT) for r in range(ROW_COUNT - 3)]
+    + [window_mask(r, c, 1, 1) for r in range(ROW_COUNT - 3) for c in range(COLUMN_COUNT - 3)]
+    + [window_mask(r + 3, c, -1, 1) for r in range(ROW_COUNT - 3) for c in range(COLUMN_COUNT - 3)]
+)
 
-# ---------------------------------------------------------
-# SCORING ALGORITHMS (HEURISTICS)
-# ---------------------------------------------------------
+CENTER_MASK = COLUMN_MASK << (COLUMN_COUNT // 2 * COLUMN_HEIGHT)
 
 
-def evaluate_window(window, piece):
+def evaluate_window(piece_count, empty_count):
     """
-    Assigns a score to a specific set of 4 cells (a window).
+    Assigns a score to a specific set of 4 cells (a window), given how many of
+    them hold our pieces and how many are empty.
     This logic helps the AI decide which move is better when not at a winning state.
     """
     score = 0
-    opp_piece = PLAYER_PIECE
-    if piece == PLAYER_PIECE:
-        opp_piece = AI_PIECE
+    # Every cell that is neither ours nor empty belongs to the opponent.
+    opp_count = WINDOW_LENGTH - piece_count - empty_count
 
     # Priority 1: Connect 4 (Win)
-    if window.count(piece) == 4:
+    if piece_count == 4:
         score += 100
     # Priority 2: Connect 3 with one empty spot (Attack)
-    elif window.count(piece) == 3 and window.count(EMPTY) == 1:
+    elif piece_count == 3 and empty_count == 1:
         score += 5
     # Priority 3: Connect 2 with two empty spots (Setup)
-    elif window.count(piece) == 2 and window.count(EMPTY) == 2:
+    elif piece_count == 2 and empty_count == 2:
         score += 2
 
     # Priority 4: Block Opponent (Defense)
     # If the opponent has 3 pieces and 1 empty spot, penalize heavily to encourage blocking.
-    if window.count(opp_piece) == 3 and window.count(EMPTY) == 1:
+    if opp_count == 3 and empty_count == 1:
         score -= 4
 
     return score
 
 
+# A window's score depends only on how many of its cells are ours and how many
+# are empty, so every possible score is computed once up front and looked up
+# by piece_count * (WINDOW_LENGTH + 1) + empty_count.
+SCORE_TABLE = tuple(
+    evaluate_window(piece_count, empty_count)
+    for piece_count in range(WINDOW_LENGTH + 1)
+    for empty_count in range(WINDOW_LENGTH + 1)
+)
+
+
 def score_position(board, piece):
     """
     Calculates the total score of the board for the AI.
     It sums up the scores of all horizontal, vertical, and diagonal windows.
     """
     score = 0
+    pieces = get_pieces(board, piece)
+    empty = ~board[MASK]
 
     # Preference: Center Column
     # Controlling the center is strategically better in Connect 4.
-    center_array = [i[COLUMN_COUNT // 2] for i in board]
-    center_count = center_array.count(piece)
+    center_count = (pieces & CENTER_MASK).bit_count()
     score += center_count * 3
 
-    # Score Horizontal
-    for r in range(ROW_COUNT):
-        row_array = board[r]
-        for c in range(COLUMN_COUNT - 3):
-            window = row_array[c:c+WINDOW_LENGTH]
-            score += evaluate_window(window, piece)
-
-    # Score Vertical
-    for c in range(COLUMN_COUNT):
-        col_array = [row[c] for row in board]
-        for r in range(ROW_COUNT - 3):
-            window = col_array[r:r+WINDOW_LENGTH]
-            score += evaluate_window(window, piece)
-
-    # Score Positive Diagonal
-    for r in range(ROW_COUNT - 3):
-        for c in range(COLUMN_COUNT - 3):
-            window = [board[r+i][c+i] for i in range(WINDOW_LENGTH)]
-            score += evaluate_window(window, piece)
-
-    # Score Negative Diagonal
-    for r in range(ROW_COUNT - 3):
-        for c in range(COLUMN_COUNT - 3):
-            window = [board[r+3-i][c+i] for i in range(WINDOW_LENGTH)]
-            score += evaluate_window(window, piece)
+    # Score every window from the bits it shares with our pieces and the empty cells
+    for window in WINDOWS:
+        score += SCORE_TABLE[(pieces & window).bit_count() * (WINDOW_LENGTH + 1) + (empty & window).bit_count()]
 
     return score
 
+# ---------------------------------------------------------
+# TRANSPOSITION TABLE
+# ---------------------------------------------------------
+# Different move orders often lead to the same board. Search results are
+# cached per position so a repeated position is not searched again.
+# Each entry is (depth, flag, value, column), where the flag says whether
+# value is the exact score or only a bound found by a pruned search.
+EXACT = 0
+LOWERBOUND = 1
+UPPERBOUND = 2
+
+transposition_table = {}
+
+
+def position_key(board, ai_to_move):
+    """
+    Returns a unique integer key for the board and the side to move.
+    Every column of mask is a solid block of bits from the bottom, so adding
+    position to it never collides between two different boards.
+    """
+    return ((board[MASK] + board[POSITION]) << 1) | ai_to_move
+
+
+def store_entry(key, depth, value, column, alpha, beta):
+    """Caches a search result, flagged by where value fell in the (alpha, beta) window."""
+    if value <= alpha:
+        flag = UPPERBOUND
+    elif value >= beta:
+        flag = LOWERBOUND
+    else:
+        flag = EXACT
+    transposition_table[key] = (depth, flag, value, column)
+
 # ---------------------------------------------------------
 # MINIMAX ALGORITHM
 # ---------------------------------------------------------
 
 
-def minimax(board, depth, maximizingPlayer):
+def negamax(board, depth, alpha, beta, color, column_order=COLUMN_ORDER, scores=None):
     """
-    The main Minimax algorithm.
+    The main Minimax algorithm with Alpha-Beta pruning, in Negamax form.
     It recursively simulates future moves to find the best possible outcome.
+    color is 1 when the AI is to move and -1 when the Human is; scores are
+    always from the point of view of the player to move, so a child's score
+    is simply negated instead of having separate maximizing/minimizing code.
+    alpha is the best score the player to move can already guarantee, beta the
+    best score the opponent can already guarantee; branches outside that
+    window are skipped.
+    Columns are tried in column_order; if a scores dict is given, the score of
+    each column searched at this level is recorded in it.
     """
-    valid_locations = get_valid_locations(board)
-    is_terminal = is_terminal_node(board)
+    # Reuse a previous result for this position if it was searched deep enough.
+    # A bound from a pruned search narrows the window instead.
+    key = position_key(board, color == 1)
+    entry = transposition_table.get(key)
+    entry_column = None
+    if entry is not None:
+        entry_depth, flag, entry_value, entry_column = entry
+    if entry is not None and entry_depth >= depth:
+        if flag == EXACT:
+            return entry_column, entry_value
+        elif flag == LOWERBOUND:
+            alpha = max(alpha, entry_value)
+        else:
+            beta = min(beta, entry_value)
+        if alpha >= beta:
+            return entry_column, entry_value
+
+    # Only the player who made the last move can have just connected 4,
+    # and the game is a draw once every cell is filled.
+    last_piece = PLAYER_PIECE if color == 1 else AI_PIECE
+    is_win = winning_move(board, last_piece)
+    is_terminal = is_win or board[MASK] == FULL_BOARD_MASK
 
     # Base Case: Stop recursion if game over or depth limit reached
     if depth == 0 or is_terminal:
-        if is_terminal:
-            if winning_move(board, AI_PIECE):
-                return (None, 100000000000000)  # AI Wins
-            elif winning_move(board, PLAYER_PIECE):
-                return (None, -10000000000000)  # Player Wins
+        if is_win:
+            if last_piece == AI_PIECE:
+                value = 100000000000000  # AI Wins
             else:
-                return (None, 0)  # Draw
+                value = -10000000000000  # Player Wins
+        elif is_terminal:
+            value = 0  # Draw
         else:
             # Depth is zero: return the heuristic score of the current board state
-            return (None, score_position(board, AI_PIECE))
-
-    # Maximizing Player Logic (AI)
-    # The AI tries to maximize the score.
-    if maximizingPlayer:
-        value = -math.inf
-        column = random.choice(valid_locations)
-
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-
-            # Create a copy of the board to simulate the move
-            b_copy = copy.deepcopy(board)
-            drop_piece(b_copy, row, col, AI_PIECE)
-
-            # Recursive call
-            new_score = minimax(b_copy, depth-1, False)[1]
-
-            # Check if this move is better than what we found so far
-            if new_score > value:
-                value = new_score
-                column = col
-
-        return column, value
-
-    # Minimizing Player Logic (Human)
-    # The AI assumes the Human plays perfectly to minimize the AI's score.
-    else:
-        value = math.inf
-        column = random.choice(valid_locations)
-
-        for col in valid_locations:
-            row = get_next_open_row(board, col)
-
-            # Create a copy of the board to simulate the move
-            b_copy = copy.deepcopy(board)
-            drop_piece(b_copy, row, col, PLAYER_PIECE)
+            value = score_position(board, AI_PIECE)
+        # Scores above are from the AI's point of view; flip them for the Human
+        value *= color
+        transposition_table[key] = (depth, EXACT, value, None)
+        return (None, value)
+
+    # Adding one bit at the bottom of every column carries through its occupied
+    # cells into the next open one, so this holds the cell each column's next
+    # piece would land in. Full columns carry into the sentinel bit, which is
+    # masked away.
+    open_cells = (board[MASK] + BOTTOM_MASK) & FULL_BOARD_MASK
+    valid_locations = [col for col in column_order if open_cells & COLUMN_BITS[col]]
+
+    # Move ordering: try the best column from an earlier, shallower search first
+    if entry_column in valid_locations:
+        valid_locations.remove(entry_column)
+        valid_locations.insert(0, entry_column)
+
+    alpha_orig, beta_orig = alpha, beta
+    value = NEG_INF
+    column = random.choice(valid_locations)
+
+    for col in valid_locations:
+        move = open_cells & COLUMN_BITS[col]
+        mask, position = board
+
+        # Simulate the move in place, then undo it after the recursive call
+        board[MASK] = mask | move
+        if color == 1:
+            board[POSITION] = position | move
+        if col == valid_locations[0]:
+            new_score = -negamax(board, depth-1, -beta, -alpha, -color)[1]
+        else:
+            # Principal Variation Search: the first (best-ordered) column is
+            # expected to be best, so the others only need to be proven worse
+            # with a cheap null-window search. Search again with the full
+            # window only if one of them turns out better after all.
+            new_score = -negamax(board, depth-1, -alpha-1, -alpha, -color)[1]
+            if alpha < new_score < beta:
+                new_score = -negamax(board, depth-1, -beta, -new_score, -color)[1]
+        board[MASK], board[POSITION] = mask, position
+        if scores is not None:
+            scores[col] = new_score
+
+        # Check if this move is better than what we found so far
+        if new_score > value:
+            value = new_score
+            column = col
+
+        # Pruning: the opponent will never allow this branch
+        alpha = max(alpha, value)
+        if alpha >= beta:
+            break
+
+    store_entry(key, depth, value, column, alpha_orig, beta_orig)
+    return column, value
+
+
+def find_best_move(board):
+    """
+    Iterative deepening: runs Minimax at depth 1, 2, ..., SEARCH_DEPTH.
+    Each iteration tries the columns in the order of the scores found by the
+    previous one, so the most promising move is searched first.
+    """
+    # Opening book: on an empty board the center column is always the best move
+    if board[MASK] == 0:
+        return COLUMN_ORDER[0], 0
 
-            # Recursive call
-            new_score = minimax(b_copy, depth-1, True)[1]
+    ordered_cols = COLUMN_ORDER
+    for depth in range(1, SEARCH_DEPTH + 1):
+        scores = {}
+        col, minimax_score = negamax(board, depth, NEG_INF, INF, 1, ordered_cols, scores)
+        ordered_cols = sorted(ordered_cols, key=lambda c: scores.get(c, NEG_INF), reverse=True)
+    return col, minimax_score
 
-            # Check if this move is worse for the AI (better for Human)
-            if new_score < value:
-                value = new_score
-                column = col
 
-        return column, value
+def build_opening_book():
+    """
+    Searches the AI's reply to every possible first move of the Human once.
+    The results stay in the transposition table (which is kept for the whole
+    session), so the AI answers the opening move without thinking.
+    """
+    for col in range(COLUMN_COUNT):
+        board = create_board()
+        drop_piece(board, 0, col, PLAYER_PIECE)
+        find_best_move(board)
 
 # ---------------------------------------------------------
 # MAIN GAME LOOP
@@ -260,6 +423,11 @@ def play_game():
 
     print("=== CONNECT 4 CONSOLE GAME ===")
     print(f"Human (Player 1) vs AI (Player 2)")
+
+    # If the Human starts, prepare the AI's replies to their first move now
+    if turn == 0:
+        build_opening_book()
+
     print_board(board)
 
     while not game_over:
@@ -303,7 +471,7 @@ def play_game():
             print("AI is calculating best move...")
 
             # Run Minimax to determine the best column
-            col, minimax_score = minimax(board, SEARCH_DEPTH, True)
+            col, minimax_score = find_best_move(board)
 
             if is_valid_location(board, col):
                 row = get_next_open_row(board, col)